@@ -1,8 +1,7 @@
 import math
 import sys
 import pygame
-import numpy as np
-from typing import List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional
 
 # Initialize pygame
 pygame.init()
@@ -25,9 +24,93 @@ pygame.display.set_caption("AI Tic-Tac-Toe - Minimax Algorithm")
 font = pygame.font.SysFont('Arial', 40)
 small_font = pygame.font.SysFont('Arial', 30)
 
+# Empty board with grid lines, drawn once and blitted at the start of each frame
+BACKGROUND_SURF = pygame.Surface((WIDTH, HEIGHT)).convert()
+BACKGROUND_SURF.fill(BG_COLOR)
+for i in range(1, BOARD_SIZE):
+    # Vertical lines
+    pygame.draw.line(BACKGROUND_SURF, LINE_COLOR, 
+                    (i * CELL_SIZE, 0), 
+                    (i * CELL_SIZE, HEIGHT - 100), 
+                    GRID_WIDTH)
+    # Horizontal lines
+    pygame.draw.line(BACKGROUND_SURF, LINE_COLOR, 
+                    (0, i * CELL_SIZE), 
+                    (WIDTH, i * CELL_SIZE), 
+                    GRID_WIDTH)
+
+# X and O pieces, drawn once into transparent cell-sized surfaces
+X_SURF = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA).convert_alpha()
+O_SURF = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA).convert_alpha()
+piece_center = CELL_SIZE // 2
+piece_size = CELL_SIZE // 3
+pygame.draw.line(X_SURF, PLAYER_COLOR,
+                 (piece_center - piece_size, piece_center - piece_size),
+                 (piece_center + piece_size, piece_center + piece_size), 8)
+pygame.draw.line(X_SURF, PLAYER_COLOR,
+                 (piece_center + piece_size, piece_center - piece_size),
+                 (piece_center - piece_size, piece_center + piece_size), 8)
+pygame.draw.circle(O_SURF, AI_COLOR, (piece_center, piece_center), piece_size, 8)
+
+# Bitboards: bit (row * BOARD_SIZE + col) is set when that cell is taken
+FULL_BOARD = 0b111111111
+WIN_MASKS = (
+    0b111000000, 0b000111000, 0b000000111,  # Rows
+    0b100100100, 0b010010010, 0b001001001,  # Columns
+    0b100010001, 0b001010100,               # Diagonals
+)
+# Center first, then corners, then edges, so alpha-beta sees strong moves early
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+# MOVE_ORDER with cell i moved to the front, for trying a known best move first
+MOVE_ORDER_FROM = tuple((i,) + tuple(j for j in MOVE_ORDER if j != i)
+                        for i in range(BOARD_SIZE * BOARD_SIZE))
+# WIN_LUT[bb] is 1 when bitboard bb contains a complete line
+WIN_LUT = bytes(1 if any(bb & mask == mask for mask in WIN_MASKS) else 0
+                for bb in range(FULL_BOARD + 1))
+
+def symmetric_cell(idx: int, turns: int, flip: bool) -> int:
+    """Map a cell index through an optional mirror and quarter turns"""
+    row, col = divmod(idx, BOARD_SIZE)
+    if flip:
+        col = BOARD_SIZE - 1 - col
+    for _ in range(turns):
+        row, col = col, BOARD_SIZE - 1 - row
+    return row * BOARD_SIZE + col
+
+# The 8 rotations/reflections of the board as cell permutations: cell i
+# moves to SYM_PERMS[s][i], and PERM_TABLE[s][bb] applies that to a bitboard
+SYM_PERMS = [tuple(symmetric_cell(i, turns, flip) for i in range(BOARD_SIZE * BOARD_SIZE))
+             for flip in (False, True) for turns in range(4)]
+INVERSE_PERMS = [tuple(perm.index(i) for i in range(BOARD_SIZE * BOARD_SIZE))
+                 for perm in SYM_PERMS]
+PERM_TABLE = [[sum(1 << perm[i] for i in range(BOARD_SIZE * BOARD_SIZE) if bb >> i & 1)
+               for bb in range(FULL_BOARD + 1)]
+              for perm in SYM_PERMS]
+
+def canonical(x_bb: int, o_bb: int) -> Tuple[int, int, int]:
+    """Return the smallest (x_bb, o_bb) among the board's 8 symmetric forms,
+    followed by the index of the symmetry that produces it"""
+    return min((table[x_bb], table[o_bb], sym) for sym, table in enumerate(PERM_TABLE))
+
+# Transposition table bound flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class TTEntry(NamedTuple):
+    depth: int  # Remaining plies searched below this position
+    value: float  # Win/loss scores are stored relative to this position
+    flag: int
+    best_move: Optional[int]  # Cell index in the canonical frame
+
+# Perfect-play reply for every reachable position with the AI to move, keyed
+# on (x_bb, o_bb). Filled in once by the first TicTacToe instance.
+BEST_MOVE: Dict[Tuple[int, int], Tuple[int, int]] = {}
+# (nodes explored, search depth) recorded while solving each position
+SEARCH_STATS: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
 class TicTacToe:
     def __init__(self):
-        self.board = [[' ' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        self.x_bb = 0
+        self.o_bb = 0
         self.current_player = 'X'  # Human is X
         self.game_over = False
         self.winner = None
@@ -43,9 +126,18 @@ class TicTacToe:
         # Minimax statistics
         self.nodes_explored = 0
         self.depth_reached = 0
+        self.ai_info_surf = None  # Rendered by the UI after each AI move
+        
+        # Transposition table, keyed on the canonical form of each position
+        self.tt = {}
+        
+        if not BEST_MOVE:
+            self.solve_positions()
+            self.reset_game()
         
     def reset_game(self):
-        self.board = [[' ' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        self.x_bb = 0
+        self.o_bb = 0
         self.current_player = 'X'
         self.game_over = False
         self.winner = None
@@ -53,12 +145,18 @@ class TicTacToe:
         self.moves_made = 0
         self.nodes_explored = 0
         self.depth_reached = 0
+        self.ai_info_surf = None
+        self.tt = {}
     
     def make_move(self, row: int, col: int, player: str) -> bool:
-        if self.game_over or self.board[row][col] != ' ':
+        bit = 1 << (row * BOARD_SIZE + col)
+        if self.game_over or (self.x_bb | self.o_bb) & bit:
             return False
             
-        self.board[row][col] = player
+        if player == 'X':
+            self.x_bb |= bit
+        else:
+            self.o_bb |= bit
         self.moves_made += 1
         
         # Check for win
@@ -77,120 +175,195 @@ class TicTacToe:
         return True
     
     def check_winner(self, player: str) -> bool:
-        # Check rows and columns
-        for i in range(BOARD_SIZE):
-            if all(self.board[i][j] == player for j in range(BOARD_SIZE)):
-                return True
-            if all(self.board[j][i] == player for j in range(BOARD_SIZE)):
-                return True
-        
-        # Check diagonals
-        if all(self.board[i][i] == player for i in range(BOARD_SIZE)):
-            return True
-        if all(self.board[i][BOARD_SIZE-1-i] == player for i in range(BOARD_SIZE)):
-            return True
-        
-        return False
+        return WIN_LUT[self.x_bb if player == 'X' else self.o_bb] == 1
     
     def get_empty_cells(self) -> List[Tuple[int, int]]:
-        return [(i, j) for i in range(BOARD_SIZE) for j in range(BOARD_SIZE) 
-                if self.board[i][j] == ' ']
+        empty = ~(self.x_bb | self.o_bb) & FULL_BOARD
+        return [divmod(i, BOARD_SIZE) for i in MOVE_ORDER if empty >> i & 1]
     
-    def minimax(self, depth: int, is_maximizing: bool, alpha: float = -math.inf, 
-                beta: float = math.inf) -> Tuple[float, Optional[Tuple[int, int]]]:
+    def negamax(self, depth: int, player: str, alpha: float = -math.inf,
+                beta: float = math.inf,
+                max_depth: int = BOARD_SIZE * BOARD_SIZE) -> Tuple[float, Optional[int]]:
+        """Minimax in negamax form: scores are from the point of view of player,
+        the side to move, and each child's score is negated by its parent.
+        Positions at max_depth that are not over score 0. The best move is
+        returned as a cell index."""
         self.nodes_explored += 1
-        self.depth_reached = max(self.depth_reached, depth)
+        if depth > self.depth_reached:
+            self.depth_reached = depth
         
-        # Terminal states
-        if self.check_winner('O'):  # AI wins
-            return 10 - depth, None
-        if self.check_winner('X'):  # Human wins
+        # Terminal states: only the opponent, who just moved, can have won
+        opponent = 'O' if player == 'X' else 'X'
+        if WIN_LUT[self.x_bb if opponent == 'X' else self.o_bb]:
             return depth - 10, None
-        if not self.get_empty_cells():  # Draw
+        if (self.x_bb | self.o_bb) == FULL_BOARD:  # Draw
             return 0, None
         
-        best_move = None
-        
-        if is_maximizing:  # AI's turn (O)
-            max_eval = -math.inf
-            for row, col in self.get_empty_cells():
-                self.board[row][col] = 'O'
-                eval_score, _ = self.minimax(depth + 1, False, alpha, beta)
-                self.board[row][col] = ' '
-                
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = (row, col)
-                
-                alpha = max(alpha, eval_score)
+        # Transposition table lookup, shared by all symmetric positions
+        canon_x, canon_o, sym = canonical(self.x_bb, self.o_bb)
+        key = (canon_x, canon_o, player)
+        remaining = min(max_depth, self.max_moves - self.moves_made) - depth
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            # Map the stored move back from the canonical frame
+            tt_move = INVERSE_PERMS[sym][entry.best_move]
+        if entry is not None and entry.depth >= remaining:
+            value = self.score_from_tt(entry.value, depth)
+            if entry.flag == EXACT:
+                return value, tt_move
+            # A bound only narrows the window. Skip it at the root, where a
+            # narrowed window can leave best_move on a child that failed low.
+            if depth > 0:
+                if entry.flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
                 if beta <= alpha:
-                    break  # Beta cut-off
-                    
-            return max_eval, best_move
-        else:  # Minimizing (Human's turn - X)
-            min_eval = math.inf
-            for row, col in self.get_empty_cells():
-                self.board[row][col] = 'X'
-                eval_score, _ = self.minimax(depth + 1, True, alpha, beta)
-                self.board[row][col] = ' '
-                
-                if eval_score < min_eval:
-                    min_eval = eval_score
-                    best_move = (row, col)
+                    return value, tt_move
+        if remaining == 0:  # Search horizon
+            return 0, None
+        alpha_orig, beta_orig = alpha, beta
+        
+        # Walk the empty cells straight off the bitboards, trying the previously
+        # best move before the static order
+        empty = ~(self.x_bb | self.o_bb) & FULL_BOARD
+        order = MOVE_ORDER if tt_move is None else MOVE_ORDER_FROM[tt_move]
+        
+        best_eval = -math.inf
+        best_move = None
+        for idx in order:
+            bit = 1 << idx
+            if not empty & bit:
+                continue
+            # Place and undo the stone by toggling its bit
+            if player == 'X':
+                self.x_bb ^= bit
+                eval_score, _ = self.negamax(depth + 1, opponent, -beta, -alpha, max_depth)
+                self.x_bb ^= bit
+            else:
+                self.o_bb ^= bit
+                eval_score, _ = self.negamax(depth + 1, opponent, -beta, -alpha, max_depth)
+                self.o_bb ^= bit
+            eval_score = -eval_score
+            
+            if eval_score > best_eval:
+                best_eval = eval_score
+                best_move = idx
+            
+            alpha = max(alpha, eval_score)
+            if alpha >= beta:
+                break  # Cut-off
                 
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break  # Alpha cut-off
-                    
-            return min_eval, best_move
+        self.store_tt(key, remaining, depth, best_eval, alpha_orig, beta_orig,
+                      SYM_PERMS[sym][best_move])
+        return best_eval, best_move
+    
+    def store_tt(self, key, remaining: int, depth: int, value: float, alpha: float,
+                 beta: float, best_move: Optional[int]):
+        if value <= alpha:
+            flag = UPPER  # Failed low, true score is at most value
+        elif value >= beta:
+            flag = LOWER  # Failed high, true score is at least value
+        else:
+            flag = EXACT
+        self.tt[key] = TTEntry(remaining, self.score_to_tt(value, depth), flag, best_move)
+    
+    @staticmethod
+    def score_to_tt(value: float, depth: int) -> float:
+        # Scores are +/-(10 - depth) from the search root; rebase them onto this
+        # position so entries stay valid when reached by a different root
+        if value > 0:
+            return value + depth
+        if value < 0:
+            return value - depth
+        return value
+    
+    @staticmethod
+    def score_from_tt(value: float, depth: int) -> float:
+        if value > 0:
+            return value - depth
+        if value < 0:
+            return value + depth
+        return value
+    
+    def solve_positions(self, player: str = 'X'):
+        """Fill BEST_MOVE by searching every position reachable from this one"""
+        empties = self.get_empty_cells()
+        if self.check_winner('X') or self.check_winner('O') or not empties:
+            return
+        
+        if player == 'O':
+            key = (self.x_bb, self.o_bb)
+            if key in BEST_MOVE:
+                return
+            self.nodes_explored = 0
+            self.depth_reached = 0
+            BEST_MOVE[key] = self.get_ai_move_iddfs()
+            SEARCH_STATS[key] = (self.nodes_explored, self.depth_reached)
+        
+        for row, col in empties:
+            bit = 1 << (row * BOARD_SIZE + col)
+            self.moves_made += 1
+            if player == 'X':
+                self.x_bb ^= bit
+                self.solve_positions('O')
+                self.x_bb ^= bit
+            else:
+                self.o_bb ^= bit
+                self.solve_positions('X')
+                self.o_bb ^= bit
+            self.moves_made -= 1
+    
+    def get_ai_move_iddfs(self) -> Optional[Tuple[int, int]]:
+        """Search the AI move with iterative deepening. Each pass leaves best
+        moves in the transposition table that order the next, deeper pass."""
+        move = None
+        for max_depth in range(1, self.max_moves - self.moves_made + 1):
+            score, move = self.negamax(0, 'O', max_depth=max_depth)
+            if score != 0:  # Forced win or loss, deeper passes can't change it
+                break
+        return None if move is None else divmod(move, BOARD_SIZE)
     
     def get_ai_move(self) -> Tuple[int, int]:
-        """Get AI move using Minimax with Alpha-Beta pruning"""
-        _, move = self.minimax(0, True)
+        """Get AI move from the precomputed Minimax table"""
+        key = (self.x_bb, self.o_bb)
+        move = BEST_MOVE.get(key)
+        if move is not None:
+            self.nodes_explored, self.depth_reached = SEARCH_STATS[key]
+            return move
+        
+        # Not reachable in a normal game, fall back to searching it
+        move = self.get_ai_move_iddfs()
         if move is None:  # Shouldn't happen in valid game state
             return self.get_empty_cells()[0]
         return move
     
     def is_valid_move(self, row: int, col: int) -> bool:
         return (0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE 
-                and self.board[row][col] == ' ')
+                and not (self.x_bb | self.o_bb) & (1 << (row * BOARD_SIZE + col)))
+
+# Rendered text, keyed on (text, font, color), so each string is rasterized once
+text_cache: Dict[Tuple[str, pygame.font.Font, Tuple[int, int, int]], pygame.Surface] = {}
+
+def cached_render(text: str, text_font: pygame.font.Font,
+                  color: Tuple[int, int, int]) -> pygame.Surface:
+    key = (text, text_font, color)
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = text_cache[key] = text_font.render(text, True, color)
+    return surface
 
 def draw_board(game: TicTacToe):
-    screen.fill(BG_COLOR)
-    
-    # Draw grid lines
-    for i in range(1, BOARD_SIZE):
-        # Vertical lines
-        pygame.draw.line(screen, LINE_COLOR, 
-                        (i * CELL_SIZE, 0), 
-                        (i * CELL_SIZE, HEIGHT - 100), 
-                        GRID_WIDTH)
-        # Horizontal lines
-        pygame.draw.line(screen, LINE_COLOR, 
-                        (0, i * CELL_SIZE), 
-                        (WIDTH, i * CELL_SIZE), 
-                        GRID_WIDTH)
+    screen.blit(BACKGROUND_SURF, (0, 0))
     
     # Draw X's and O's
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            cell_x = col * CELL_SIZE + CELL_SIZE // 2
-            cell_y = row * CELL_SIZE + CELL_SIZE // 2
-            
-            if game.board[row][col] == 'X':
-                # Draw X
-                size = CELL_SIZE // 3
-                pygame.draw.line(screen, PLAYER_COLOR,
-                               (cell_x - size, cell_y - size),
-                               (cell_x + size, cell_y + size), 8)
-                pygame.draw.line(screen, PLAYER_COLOR,
-                               (cell_x + size, cell_y - size),
-                               (cell_x - size, cell_y + size), 8)
-            elif game.board[row][col] == 'O':
-                # Draw O
-                radius = CELL_SIZE // 3
-                pygame.draw.circle(screen, AI_COLOR, 
-                                 (cell_x, cell_y), radius, 8)
+    for idx in range(BOARD_SIZE * BOARD_SIZE):
+        row, col = divmod(idx, BOARD_SIZE)
+        if game.x_bb >> idx & 1:
+            screen.blit(X_SURF, (col * CELL_SIZE, row * CELL_SIZE))
+        elif game.o_bb >> idx & 1:
+            screen.blit(O_SURF, (col * CELL_SIZE, row * CELL_SIZE))
     
     # Highlight last AI move
     if game.last_ai_move:
@@ -215,31 +388,38 @@ def draw_board(game: TicTacToe):
         status_text = f"Your Turn (X)" if game.current_player == 'X' else "AI Thinking..."
         status_color = PLAYER_COLOR if game.current_player == 'X' else AI_COLOR
     
-    status_surface = font.render(status_text, True, status_color)
+    status_surface = cached_render(status_text, font, status_color)
     screen.blit(status_surface, (WIDTH // 2 - status_surface.get_width() // 2, status_y))
     
     # Statistics
     stats_y = HEIGHT - 50
     stats_text = f"Wins: You {game.player_wins} - AI {game.ai_wins} | Draws: {game.draws}"
-    stats_surface = small_font.render(stats_text, True, TEXT_COLOR)
+    stats_surface = cached_render(stats_text, small_font, TEXT_COLOR)
     screen.blit(stats_surface, (WIDTH // 2 - stats_surface.get_width() // 2, stats_y))
     
     # Minimax info (only show when AI is playing)
-    if game.current_player == 'O' and not game.game_over:
-        info_y = 10
-        info_text = f"Minimax Analysis: Nodes Explored: {game.nodes_explored}"
-        info_surface = small_font.render(info_text, True, TEXT_COLOR)
-        screen.blit(info_surface, (10, info_y))
-        
-        depth_text = f"Search Depth: {game.depth_reached}"
-        depth_surface = small_font.render(depth_text, True, TEXT_COLOR)
-        screen.blit(depth_surface, (10, info_y + 30))
+    if game.current_player == 'O' and not game.game_over and game.ai_info_surf:
+        screen.blit(game.ai_info_surf, (10, 10))
+
+def render_ai_info(game: TicTacToe) -> pygame.Surface:
+    """Render the Minimax statistics of the last AI move into one surface"""
+    info_text = f"Minimax Analysis: Nodes Explored: {game.nodes_explored}"
+    info_surface = small_font.render(info_text, True, TEXT_COLOR)
+    depth_text = f"Search Depth: {game.depth_reached}"
+    depth_surface = small_font.render(depth_text, True, TEXT_COLOR)
+    
+    width = max(info_surface.get_width(), depth_surface.get_width())
+    height = 30 + depth_surface.get_height()
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    surface.blit(info_surface, (0, 0))
+    surface.blit(depth_surface, (0, 30))
+    return surface
 
 def draw_button(text, x, y, width, height, color):
     pygame.draw.rect(screen, color, (x, y, width, height), border_radius=10)
     pygame.draw.rect(screen, TEXT_COLOR, (x, y, width, height), 2, border_radius=10)
     
-    text_surface = small_font.render(text, True, TEXT_COLOR)
+    text_surface = cached_render(text, small_font, TEXT_COLOR)
     text_rect = text_surface.get_rect(center=(x + width // 2, y + height // 2))
     screen.blit(text_surface, text_rect)
     
@@ -255,16 +435,31 @@ def main():
     reset_rect = pygame.Rect(WIDTH - 150, HEIGHT - 90, 140, 40)
     quit_rect = pygame.Rect(WIDTH - 150, HEIGHT - 40, 140, 40)
     
-    # Main game loop
+    # Main game loop. The screen is only redrawn when something on it changed.
     running = True
+    dirty = True
+    hover_reset = hover_quit = False
+    reset_color, quit_color = (52, 152, 219), (192, 57, 43)
     while running:
-        mouse_pos = pygame.mouse.get_pos()
-        
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             
+            elif event.type == pygame.VIDEOEXPOSE:
+                dirty = True
+            
+            elif event.type == pygame.MOUSEMOTION:
+                new_hover_reset = reset_rect.collidepoint(event.pos)
+                new_hover_quit = quit_rect.collidepoint(event.pos)
+                if new_hover_reset != hover_reset or new_hover_quit != hover_quit:
+                    hover_reset, hover_quit = new_hover_reset, new_hover_quit
+                    reset_color = (41, 128, 185) if hover_reset else (52, 152, 219)
+                    quit_color = (231, 76, 60) if hover_quit else (192, 57, 43)
+                    dirty = True
+            
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                dirty = True
+                mouse_pos = event.pos
                 # Check button clicks
                 if reset_rect.collidepoint(mouse_pos):
                     game.reset_game()
@@ -283,25 +478,26 @@ def main():
                             pygame.time.set_timer(pygame.USEREVENT, ai_think_time)
             
             elif event.type == pygame.USEREVENT and ai_thinking:
+                dirty = True
                 # AI's turn
                 if not game.game_over and game.current_player == 'O':
                     ai_row, ai_col = game.get_ai_move()
+                    game.ai_info_surf = render_ai_info(game)
                     game.make_move(ai_row, ai_col, 'O')
                     game.last_ai_move = (ai_row, ai_col)
                 ai_thinking = False
                 pygame.time.set_timer(pygame.USEREVENT, 0)  # Clear timer
         
-        # Draw everything
-        draw_board(game)
-        
-        # Draw buttons
-        reset_color = (41, 128, 185) if reset_rect.collidepoint(mouse_pos) else (52, 152, 219)
-        quit_color = (231, 76, 60) if quit_rect.collidepoint(mouse_pos) else (192, 57, 43)
-        
-        reset_rect = draw_button("New Game", WIDTH - 150, HEIGHT - 90, 140, 40, reset_color)
-        quit_rect = draw_button("Quit", WIDTH - 150, HEIGHT - 40, 140, 40, quit_color)
-        
-        pygame.display.flip()
+        if dirty:
+            # Draw everything
+            draw_board(game)
+            
+            # Draw buttons
+            reset_rect = draw_button("New Game", WIDTH - 150, HEIGHT - 90, 140, 40, reset_color)
+            quit_rect = draw_button("Quit", WIDTH - 150, HEIGHT - 40, 140, 40, quit_color)
+            
+            pygame.display.flip()
+            dirty = False
         clock.tick(60)
     
     pygame.quit()